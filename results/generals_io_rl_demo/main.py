@@ -1,14 +1,202 @@
+import argparse
+import cProfile
+import logging
+import pstats
+from dataclasses import dataclass
+
+import numpy as np
 from generals.agents import RandomAgent, ExpanderAgent
 from generals.envs import PettingZooGenerals
 from generals import GridFactory
 
-def main():
+
+logger = logging.getLogger(__name__)
+
+# Print the state of env 0 every this many steps when debug logging is enabled
+PROGRESS_EVERY = 50
+
+# Largest grid produced by the GridFactory below; smaller maps are zero-padded.
+MAX_GRID_DIMS = (23, 23)
+
+# Row/column offsets for the UP, DOWN, LEFT, RIGHT move directions
+DIRECTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+
+
+@dataclass
+class ObsBatch:
+    """Struct-of-arrays view of one agent's observations across N envs."""
+
+    army: np.ndarray  # (N, H, W) int32
+    owned_mask: np.ndarray  # (N, H, W) bool
+    opponent_mask: np.ndarray  # (N, H, W) bool
+    passable: np.ndarray  # (N, H, W) bool, False for mountains and padding
+    visible: np.ndarray  # (N, H, W) bool
+    land_count: np.ndarray  # (N,) int32
+    army_count: np.ndarray  # (N,) int32
+
+    @classmethod
+    def empty(cls, num_envs, grid_dims=MAX_GRID_DIMS):
+        shape = (num_envs, *grid_dims)
+        return cls(
+            army=np.zeros(shape, dtype=np.int32),
+            owned_mask=np.zeros(shape, dtype=bool),
+            opponent_mask=np.zeros(shape, dtype=bool),
+            passable=np.zeros(shape, dtype=bool),
+            visible=np.zeros(shape, dtype=bool),
+            land_count=np.zeros(num_envs, dtype=np.int32),
+            army_count=np.zeros(num_envs, dtype=np.int32),
+        )
+
+    def write(self, i, obs):
+        """Copy env `i`'s observation into row `i` of the buffers, zero-padding smaller grids."""
+        h, w = np.shape(obs["armies"])
+        for grid in (self.army, self.owned_mask, self.opponent_mask, self.passable, self.visible):
+            grid[i].fill(0)
+        self.army[i, :h, :w] = obs["armies"]
+        self.owned_mask[i, :h, :w] = obs["owned_cells"]
+        self.opponent_mask[i, :h, :w] = obs["opponent_cells"]
+        np.logical_not(obs["mountains"], out=self.passable[i, :h, :w])
+        np.logical_not(obs["fog_cells"], out=self.visible[i, :h, :w])
+        self.land_count[i] = obs["owned_land_count"]
+        self.army_count[i] = obs["owned_army_count"]
+
+
+class VecPettingZooGenerals:
+    """
+    Steps `num_envs` independent PettingZooGenerals games in lockstep.
+
+    Each agent's observations live in one ObsBatch that is allocated once and
+    overwritten in place every step, so every agent decides for all envs in one
+    call without any per-step containers. Finished games are reset automatically
+    on the following step.
+    """
+
+    def __init__(self, num_envs, agents, grid_factory):
+        self.agents = list(agents)
+        self.num_envs = num_envs
+        self.envs = [
+            PettingZooGenerals(agents=self.agents, grid_factory=grid_factory, render_mode=None)
+            for _ in range(num_envs)
+        ]
+        self.observations = {agent_id: ObsBatch.empty(num_envs) for agent_id in self.agents}
+        self.rewards = {agent_id: np.zeros(num_envs, dtype=np.float32) for agent_id in self.agents}
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            self._write(i, env.reset()[0])
+        self.terminated.fill(False)
+        self.truncated.fill(False)
+        return self.observations
+
+    def step(self, actions):
+        """
+        Step every env with `actions[agent_id][env_index]`.
+
+        Returns (observations, rewards, terminated, truncated). The returned
+        buffers are reused by the next call, so copy anything that must persist.
+        """
+        done = self.terminated | self.truncated
+        for rewards in self.rewards.values():
+            rewards.fill(0)
+
+        for i, env in enumerate(self.envs):
+            if done[i]:
+                obs, _ = env.reset()
+                self.terminated[i] = self.truncated[i] = False
+            else:
+                obs, rew, term, trunc, _ = env.step({agent_id: actions[agent_id][i] for agent_id in self.agents})
+                for agent_id in self.agents:
+                    self.rewards[agent_id][i] = rew.get(agent_id, 0)
+                self.terminated[i] = term
+                self.truncated[i] = trunc
+            self._write(i, obs)
+
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    def _write(self, i, obs):
+        for agent_id in self.agents:
+            self.observations[agent_id].write(i, obs[agent_id])
+
+
+def _shift(grid, direction):
+    """Return `grid` moved so that cell (i, j) holds the value of its neighbour in `direction`."""
+    di, dj = DIRECTIONS[direction]
+    shifted = np.zeros_like(grid)
+    h, w = grid.shape[1:]
+    src_i = slice(max(di, 0), h + min(di, 0))
+    dst_i = slice(max(-di, 0), h + min(-di, 0))
+    src_j = slice(max(dj, 0), w + min(dj, 0))
+    dst_j = slice(max(-dj, 0), w + min(-dj, 0))
+    shifted[:, dst_i, dst_j] = grid[:, src_i, src_j]
+    return shifted
+
+
+def _valid_moves(obs):
+    """(N, 4, H, W) mask of moves from an owned cell with army > 1 onto a passable neighbour."""
+    movable = obs.owned_mask & (obs.army > 1)
+    return np.stack([movable & _shift(obs.passable, d) for d in range(len(DIRECTIONS))], axis=1)
+
+
+def _to_actions(valid, flat_choice):
+    """Turn a chosen flat (direction, row, col) index per env into [pass, row, col, direction, split] rows."""
+    direction, row, col = np.unravel_index(flat_choice, valid.shape[1:])
+    has_move = valid.reshape(len(valid), -1)[np.arange(len(valid)), flat_choice]
+    actions = np.zeros((len(valid), 5), dtype=np.int32)
+    actions[:, 0] = ~has_move
+    actions[:, 1] = row
+    actions[:, 2] = col
+    actions[:, 3] = direction
+    return actions
+
+
+class BatchRandomAgent(RandomAgent):
+    def __init__(self, *args, seed=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rng = np.random.default_rng(seed)
+
+    def act_batch(self, obs):
+        """Pick one uniformly random valid move per env; pass when none exists."""
+        valid = _valid_moves(obs)
+        noise = self.rng.random(valid.shape)
+        choice = np.where(valid, noise, -1.0).reshape(len(valid), -1).argmax(axis=1)
+        return _to_actions(valid, choice)
+
+
+class BatchExpanderAgent(ExpanderAgent):
+    def __init__(self, *args, seed=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rng = np.random.default_rng(seed)
+
+    def act_batch(self, obs):
+        """Prefer capturing opponent cells, then neutral cells, then any valid move."""
+        valid = _valid_moves(obs)
+        unowned = ~obs.owned_mask
+        frontier_score = np.stack(
+            [
+                _shift(obs.opponent_mask, d) * 2.0 + _shift(unowned & ~obs.opponent_mask, d) * 1.0
+                for d in range(len(DIRECTIONS))
+            ],
+            axis=1,
+        )
+        # Random tie-breaking below 1 keeps target preference intact
+        frontier_score = frontier_score + self.rng.random(valid.shape) * 0.5
+        choice = np.where(valid, frontier_score, -1.0).reshape(len(valid), -1).argmax(axis=1)
+        return _to_actions(valid, choice)
+
+
+def main(num_envs=8, max_steps=500):
     # Initialize agents
-    random_agent = RandomAgent()
-    expander_agent = ExpanderAgent()
+    random_agent = BatchRandomAgent(seed=42)
+    expander_agent = BatchExpanderAgent(seed=42)
 
     # Names are used for the environment
-    agent_names = [random_agent.id, expander_agent.id]
+    agent_names = (random_agent.id, expander_agent.id)
     # Store agents in a dictionary
     agents = {
         random_agent.id: random_agent,
@@ -19,64 +207,76 @@ def main():
     grid_factory = GridFactory(
         mode="uniform",
         min_grid_dims=(15, 15),
-        max_grid_dims=(23, 23),
+        max_grid_dims=MAX_GRID_DIMS,
         mountain_density=0.2,
         city_density=0.05,
         seed=42, # Fixed seed for reproducibility
     )
 
-    # Create environment
-    # Changed render_mode to None for headless execution in Docker.
-    # For local execution with GUI, change to render_mode="human" and ensure Pygame dependencies are met.
-    env = PettingZooGenerals(agents=agent_names, grid_factory=grid_factory, render_mode=None)
-    
-    print("Starting Generals.io simulation...")
-    observations, info = env.reset()
-    print(f"Initial observation for {env.agents[0]}: Land={observations[env.agents[0]]['owned_land_count']}, Army={observations[env.agents[0]]['owned_army_count']}")
-
-    terminated = truncated = False
-    step_count = 0
-    max_steps = 500 # Limit steps to prevent infinite loops in demo
-
-    while not (terminated or truncated) and step_count < max_steps:
-        actions = {}
-        for agent_id in env.agents:
-            # Ask agent for action
-            actions[agent_id] = agents[agent_id].act(observations[agent_id])
-        
-        # All agents perform their actions
-        observations, rewards, terminated, truncated, info = env.step(actions)
-        # env.render() # Render is disabled for headless Docker execution
-        
-        step_count += 1
-        if step_count % 50 == 0:
-            print(f"Step {step_count}:")
-            for agent_id in env.agents:
-                if agent_id in observations: # Check if agent still active
-                    print(f"  {agent_id}: Land={observations[agent_id]['owned_land_count']}, Army={observations[agent_id]['owned_army_count']}, Reward={rewards.get(agent_id, 0)}")
-                else:
-                    print(f"  {agent_id}: Eliminated")
+    # Create a batch of headless environments.
+    # For local execution with GUI, use a single PettingZooGenerals with render_mode="human".
+    venv = VecPettingZooGenerals(num_envs=num_envs, agents=agent_names, grid_factory=grid_factory)
+
+    print(f"Starting Generals.io simulation on {num_envs} environments...")
+    observations = venv.reset()
+    first_agent = agent_names[0]
+    print(f"Initial observation for {first_agent} (env 0): Land={observations[first_agent].land_count[0]}, Army={observations[first_agent].army_count[0]}")
+
+    log_progress = logger.isEnabledFor(logging.DEBUG)
+    games_finished = 0
+    games_truncated = 0
+    wins = {agent_id: 0 for agent_id in agent_names}
+
+    for step_count in range(1, max_steps + 1):
+        # Every agent acts for all environments at once
+        actions = {agent_id: agents[agent_id].act_batch(observations[agent_id]) for agent_id in agent_names}
+
+        observations, rewards, terminated, truncated = venv.step(actions)
+
+        games_finished += int(terminated.sum())
+        games_truncated += int(truncated.sum())
+        for agent_id in agent_names:
+            wins[agent_id] += int(np.count_nonzero(terminated & (rewards[agent_id] > 0)))
+
+        # log_progress is checked first, so the modulo only runs when debug output is on
+        if log_progress and step_count % PROGRESS_EVERY == 0:
+            logger.debug("Step %d (env 0):", step_count)
+            for agent_id in agent_names:
+                obs = observations[agent_id]
+                logger.debug(
+                    "  %s: Land=%d, Army=%d, Reward=%s",
+                    agent_id,
+                    obs.land_count[0],
+                    obs.army_count[0],
+                    rewards[agent_id][0],
+                )
 
     print("\nSimulation finished.")
-    if terminated:
-        print("Game terminated.")
-    elif truncated:
-        print("Game truncated (max steps reached).")
-    else:
-        print("Game ended unexpectedly.")
-
-    # Report final rewards/winner
-    winner_found = False
-    for agent_id in env.agents:
-        if rewards.get(agent_id, 0) > 0:
-            print(f"Winner: {agent_id} (Reward: {rewards[agent_id]})\n")
-            winner_found = True
-        elif rewards.get(agent_id, 0) < 0:
-            print(f"Loser: {agent_id} (Reward: {rewards[agent_id]})\n")
-    if not winner_found:
+    print(f"Games terminated: {games_finished}, truncated: {games_truncated}")
+
+    # Report wins across all environments
+    for agent_id in agent_names:
+        print(f"{agent_id}: {wins[agent_id]} win(s)")
+    if not any(wins.values()):
         print("No clear winner reported (possibly truncated or draw).\n")
 
-    env.close()
+    venv.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run Generals.io agents on a batch of environments.")
+    parser.add_argument("--num-envs", type=int, default=8, help="Number of environments stepped together.")
+    parser.add_argument("--max-steps", type=int, default=500, help="Number of batched steps to run.")
+    parser.add_argument("--profile", action="store_true", help="Run under cProfile and write generals.profile.")
+    parser.add_argument("--verbose", action="store_true", help=f"Print the state of env 0 every {PROGRESS_EVERY} steps.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+
+    if args.profile:
+        # Inspect the dump interactively with `snakeviz generals.profile`
+        prof = cProfile.Profile()
+        prof.runcall(main, args.num_envs, args.max_steps)
+        prof.dump_stats("generals.profile")
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(15)
+    else:
+        main(args.num_envs, args.max_steps)
@@ -45,31 +45,50 @@ class ContextSampler:
         if fewshot_indices:  # subset few-shot docs from
             self.docs = self.docs.select(fewshot_indices)
 
-    def get_context(self, doc, num_fewshot):
+        # Format every fewshot doc once so get_context only has to index and join
+        self._texts = []
+        self._targets = []
+        for doc in self.docs:
+            self._texts.append(self._format_text(doc))
+            self._targets.append(self._format_target(doc))
+
+    def _format_text(self, doc):
+        text = self.doc_to_text(doc)
+        if self.config.doc_to_choice is None or type(text) is str:
+            return text
+        return self.doc_to_choice(doc)[text]
+
+    def _format_target(self, doc):
+        target = self.doc_to_target(doc)
+        if type(target) is list:
+            return str(target[0])
+        if self.config.doc_to_choice is None or type(target) is str:
+            return target
+        return str(self.doc_to_choice(doc)[target])
+
+    def get_context(self, doc, num_fewshot, eval_idx=None):
+        """
+        Build the fewshot context for `doc`.
+
+        `eval_idx` is the position of `doc` within the fewshot docs, if it is one of them.
+        Passing it lets the sampler drop `doc` by index instead of comparing whole docs.
+        """
         # draw an extra fewshot sample if using same split as evaluating on
         n_samples = num_fewshot + 1 if self.config.fewshot_split == self.config.test_split else num_fewshot
 
-        # draw `n_samples` docs from fewshot_docs
-        fewshotex = self.sample(n_samples)
+        # draw `n_samples` doc indices from fewshot_docs
+        fewshot_idx = self.sample(n_samples)
 
         # get rid of the doc that's the one we're evaluating, if it's in the fewshot
         # TODO: should we just stop people from using fewshot from same split as evaluating?
-        selected_docs = [x for x in fewshotex if x != doc][:num_fewshot]
+        if eval_idx is not None:
+            selected_idx = [i for i in fewshot_idx if i != eval_idx][:num_fewshot]
+        else:
+            selected_idx = [i for i in fewshot_idx if self.docs[i] != doc][:num_fewshot]
 
+        # TODO: is separating doc_to_text and doc_to_target by one space always desired?
         labeled_examples = (
-            self.fewshot_delimiter.join(
-                [
-                    # TODO: is separating doc_to_text and doc_to_target by one space always desired?
-                    (self.doc_to_text(doc) if (self.config.doc_to_choice is None or type(self.doc_to_text(doc)) is str) else self.doc_to_choice(doc)[self.doc_to_text(doc)])
-                    + self.target_delimiter
-                    + (
-                        str(self.doc_to_target(doc)[0])
-                        if type(self.doc_to_target(doc)) is list
-                        else self.doc_to_target(doc) if (self.config.doc_to_choice is None or type(self.doc_to_target(doc)) is str) else str(self.doc_to_choice(doc)[self.doc_to_target(doc)])
-                    )
-                    for doc in selected_docs
-                ]
-            )
+            self.fewshot_delimiter.join(self._texts[i] + self.target_delimiter + self._targets[i] for i in selected_idx)
             + self.fewshot_delimiter
         )
 
@@ -77,19 +96,19 @@ class ContextSampler:
 
     def sample(self, n):
         """
-        Draw `n` samples from our fewshot docs. This method should be overridden by subclasses.
+        Draw `n` sample indices from our fewshot docs. This method should be overridden by subclasses.
         """
-        return self.rnd.sample(self.docs, n)
+        return self.rnd.sample(range(len(self.docs)), n)
 
 # Original FirstNSampler class from samplers.py
 class FirstNSampler(ContextSampler):
-    def sample(self, n) -> None:
+    def sample(self, n):
         """
-        Draw the first `n` samples in order from the specified split.
+        Draw the indices of the first `n` samples in order from the specified split.
         Used for tasks with "canonical" ordered fewshot examples, such as MMLU and CMMLU.
         """
         assert n <= len(self.docs), f"Error: number of fewshot samples requested exceeds the {len(self.docs)} that are available."
-        return self.docs[:n]
+        return list(range(n))
 
 def run_sampler_demo(num_fewshot: int = 2, seed: int = 42):
     """
@@ -117,7 +136,7 @@ def run_sampler_demo(num_fewshot: int = 2, seed: int = 42):
     doc_to_evaluate_random = mock_dataset[5]
     print(f"Document to evaluate: {doc_to_evaluate_random['question']} -> {doc_to_evaluate_random['answer']}")
 
-    context_random = sampler_random.get_context(doc_to_evaluate_random, num_fewshot)
+    context_random = sampler_random.get_context(doc_to_evaluate_random, num_fewshot, eval_idx=5)
     print("\nGenerated Context:")
     print(context_random)
 
@@ -132,7 +151,7 @@ def run_sampler_demo(num_fewshot: int = 2, seed: int = 42):
     doc_to_evaluate_first_n = mock_dataset[5]
     print(f"Document to evaluate: {doc_to_evaluate_first_n['question']} -> {doc_to_evaluate_first_n['answer']}")
 
-    context_first_n = sampler_first_n.get_context(doc_to_evaluate_first_n, num_fewshot)
+    context_first_n = sampler_first_n.get_context(doc_to_evaluate_first_n, num_fewshot, eval_idx=5)
     print("\nGenerated Context:")
     print(context_first_n)
 
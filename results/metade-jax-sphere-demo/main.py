@@ -1,6 +1,5 @@
 import jax.numpy as jnp
 import jax
-from tqdm import tqdm
 from metade.util import StdSOMonitor, StdWorkflow
 from metade.algorithms.jax import create_batch_algorithm, decoder_de, MetaDE, ParamDE, DE
 from metade.problems.jax import Sphere # Using Sphere as it's simple and doesn't require extra imports like Ackley
@@ -75,20 +74,35 @@ workflow = StdWorkflow(
 key, subkey = jax.random.split(key)
 state = workflow.init(subkey)
 
-# Power-up control variables
-power_up = 0
-last_iter = False
+# Power-up control: the outer loop never reaches a power-up step, so it stays off for the whole run
+# Stored as a JAX scalar so the state pytree keeps the same structure and dtype across steps
+state = state.update_child("problem", {"power_up": jnp.int32(0)})
 
-# Run the optimization steps
-for step in tqdm(range(STEPS)):
-    state = state.update_child("problem", {"power_up": power_up})
+PROGRESS_EVERY = 10
+
+
+def _report_progress(step):
+    step = int(step) + 1
+    if step % PROGRESS_EVERY == 0 or step == STEPS:
+        print(f"Step {step}/{STEPS}")
+
+
+def _scan_step(state, step):
     state = workflow.step(state)
+    jax.debug.callback(_report_progress, step)
+    return state, None
+
+
+def run_steps(state):
+    state, _ = jax.lax.scan(_scan_step, state, jnp.arange(STEPS))
+    return state
+
 
-    if step == STEPS - 1:
-        power_up = 1
-        if last_iter:
-            break
-        last_iter = True
+# Run all optimization steps as one compiled scan instead of dispatching each step from Python.
+# The input state is donated so XLA can reuse its buffers (population, fitness) for the output;
+# `run_steps.lower(state).compile().memory_analysis()` shows the aliased bytes.
+run_steps = jax.jit(run_steps, donate_argnums=(0,))
+state = run_steps(state)
 
 # Output the best fitness result
 print(f"Best fitness: {monitor.get_best_fitness()}")
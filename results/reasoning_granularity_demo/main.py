@@ -2,8 +2,7 @@ import fire
 import pandas as pd
 from prettytable import PrettyTable
 import numpy as np
-import random
-import json
+import orjson
 import os
 
 def _generate_mock_prediction(index, question, answer):
@@ -22,15 +21,32 @@ def _generate_mock_prediction(index, question, answer):
         }
     }
 
+def _generate_mock_predictions(indices, questions, answers):
+    """Generates mock predictions from parallel index/question/answer columns."""
+    return [_generate_mock_prediction(*row) for row in zip(indices, questions, answers)]
+
+def _generate_dummy_predictions(n=5):
+    """Generates placeholder predictions used when custom results cannot be loaded."""
+    return _generate_mock_predictions(
+        [f"idx_{i}" for i in range(n)],
+        [f"Question {i}?" for i in range(n)],
+        [f"Answer {i}" for i in range(n)],
+    )
+
+# Lower/upper bounds for accuracy, reasoning granularity, F1, precision and recall
+METRIC_LOWS = np.array([0.6, 0.5, 0.55, 0.5, 0.5])
+METRIC_HIGHS = np.array([0.95, 0.9, 0.92, 0.9, 0.9])
+
 def evaluate(
     data_split: str = "CoT",
     K: float = 0.301,
     K2: float = 0.92,
     mode: str = "nl",
-    result_path: str = None
+    result_path: str = None,
+    seed: int = None
 ):
     """
-    Simulates the evaluation of a reasoning granularity framework.\n\n    This function mimics the 'evaluate.py' script described in the original project's README.\n    It demonstrates how to process different data splits and custom results,\n    calculating mock evaluation metrics like accuracy and reasoning granularity score.\n\n    Args:\n        data_split (str): The dataset split to evaluate.\n                          Can be 'CoT', 'Tool-Usage', 'custom', etc.\n        K (float): A parameter for reasoning granularity calculation.\n        K2 (float): Another parameter for reasoning granularity calculation.\n        mode (str): The evaluation mode, e.g., 'nl' for natural language.\n        result_path (str, optional): Path to a JSONL file containing custom model predictions.\n                                     Required when data_split is 'custom'.
+    Simulates the evaluation of a reasoning granularity framework.\n\n    This function mimics the 'evaluate.py' script described in the original project's README.\n    It demonstrates how to process different data splits and custom results,\n    calculating mock evaluation metrics like accuracy and reasoning granularity score.\n\n    Args:\n        data_split (str): The dataset split to evaluate.\n                          Can be 'CoT', 'Tool-Usage', 'custom', etc.\n        K (float): A parameter for reasoning granularity calculation.\n        K2 (float): Another parameter for reasoning granularity calculation.\n        mode (str): The evaluation mode, e.g., 'nl' for natural language.\n        result_path (str, optional): Path to a JSONL file containing custom model predictions.\n                                     Required when data_split is 'custom'.\n        seed (int, optional): Seed for the mock metric generator.
     """
     print(f"--- Starting Reasoning Granularity Evaluation ---")
     print(f"Parameters: data_split={data_split}, K={K}, K2={K2}, mode={mode}, result_path={result_path}")
@@ -46,18 +62,16 @@ def evaluate(
         mock_data = []
         try:
             if os.path.exists(result_path):
-                with open(result_path, 'r') as f:
-                    for line in f:
-                        mock_data.append(json.loads(line))
+                # orjson decodes each line straight from bytes; blank lines are skipped
+                with open(result_path, 'rb') as f:
+                    mock_data = [orjson.loads(line) for line in f if line.strip()]
                 print(f"Loaded {len(mock_data)} mock custom predictions.")
             else:
                 print(f"Warning: Custom result file '{result_path}' not found. Generating dummy data.")
-                for i in range(5):
-                    mock_data.append(_generate_mock_prediction(f"idx_{i}", f"Question {i}?", f"Answer {i}"))
+                mock_data = _generate_dummy_predictions()
         except Exception as e:
             print(f"Error loading custom results: {e}. Generating dummy data.")
-            for i in range(5):
-                mock_data.append(_generate_mock_prediction(f"idx_{i}", f"Question {i}?", f"Answer {i}"))
+            mock_data = _generate_dummy_predictions()
         
         # Convert mock_data to a format suitable for processing (e.g., pandas DataFrame)
         # For this demo, we'll just use the list directly for mock calculations.
@@ -69,20 +83,18 @@ def evaluate(
     else:
         # Generate a simple mock dataset for predefined splits
         num_samples = 10
-        mock_data = []
-        for i in range(num_samples):
-            question = f"What is {i} + {i+1}?"
-            answer = str(2*i + 1)
-            mock_data.append(_generate_mock_prediction(f"sample_{i}", question, answer))
+        steps = range(num_samples)
+        mock_data = _generate_mock_predictions(
+            [f"sample_{i}" for i in steps],
+            [f"What is {i} + {i+1}?" for i in steps],
+            [str(2*i + 1) for i in steps],
+        )
         print(f"Generated {num_samples} mock samples for data_split='{data_split}'.")
 
     # Simulate evaluation metrics
-    # These are random for demonstration purposes
-    accuracy = random.uniform(0.6, 0.95)
-    reasoning_granularity_score = random.uniform(0.5, 0.9)
-    f1_score = random.uniform(0.55, 0.92)
-    precision = random.uniform(0.5, 0.9)
-    recall = random.uniform(0.5, 0.9)
+    # These are random for demonstration purposes, drawn in one vectorized call
+    rng = np.random.default_rng(seed)
+    accuracy, reasoning_granularity_score, f1_score, precision, recall = rng.uniform(METRIC_LOWS, METRIC_HIGHS)
 
     # Adjust metrics slightly based on K and K2 for demo effect
     accuracy = min(1.0, accuracy + K * 0.1)
@@ -1,8 +1,10 @@
-import json
 import logging
 import operator
 import re
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated, Any, Dict, List, TypedDict
 
@@ -14,11 +16,31 @@ from service import ArticleAnalyser, ChatModel, GithubAnalyser
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Upper bound on GitHub repos fetched concurrently by process_github_repos
+MAX_REPO_WORKERS = 8
+
+# Markdown code fence at the very start (with the rest of its line) or very end of a response.
+# When nothing follows the first line, only the backticks are dropped, as there is no fence line.
+_FENCE_RE = re.compile(r"\A\s*```(?:[^\n]*\n(?=\s*\S))?|\s*```\s*\Z")
+
+# A URL pointing directly at GitHub rather than at an article
+_GH_HOST_RE = re.compile(r"^https?://(?:www\.)?github\.com/[^ \n]+", re.IGNORECASE)
+
+# Characters that are problematic on most filesystems
+_UNSAFE_RE = re.compile(r"[<>:\"/\\|?*\x00-\x1F]")
+
+# Parent of the per-run download directories used by ArticleAnalyser and GithubAnalyser
+DOWNLOAD_DIR = Path("tmp")
+
+
+class GeneratedFile(TypedDict, total=False):
+    content: str
+
 
 class ResultModel(BaseModel):
     project_name: str
     description: str
-    files: dict[str, dict[str, str]]
+    files: dict[str, GeneratedFile]
 
 
 class AgentState(TypedDict, total=False):
@@ -28,18 +50,37 @@ class AgentState(TypedDict, total=False):
     ai_response: str
     clean_response: str
     create_files: dict[str, str]
+    download_dir: str
 
 
+@lru_cache(maxsize=256)
 def _sanitize_filename(name: str) -> str:
     """Make filename safe for writing to disk."""
     name = name.strip()
-    # Replace characters that are problematic on most filesystems
-    name = re.sub(r"[<>:\"/\\|?*\x00-\x1F]", "_", name)
+    name = _UNSAFE_RE.sub("_", name)
     # Prevent path traversal
     name = Path(name).name
     return name or "file"
 
 
+def _remove_download_dir(download_dir: str | None) -> None:
+    """
+    Remove the download directory of the current run.
+
+    Every run downloads into its own directory under DOWNLOAD_DIR, so concurrent runs
+    (e.g. benchmark rows analysing the same repo) never delete each other's files.
+    DOWNLOAD_DIR itself is left in place, since another run may be creating its directory in it.
+    """
+    if not download_dir:
+        return
+    try:
+        shutil.rmtree(download_dir)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Failed to remove tmp path %s: %s", download_dir, e)
+
+
 def download_and_analyze_article(state: AgentState) -> Dict[str, Any]:
     """
     Download the article and extract GitHub links.
@@ -51,19 +92,22 @@ def download_and_analyze_article(state: AgentState) -> Dict[str, Any]:
         logger.error("No article_url provided in state.")
         return {"github_links": [], "file_paths": []}
 
+    # Downloads of this run go to a private directory, removed again by generate_solution
+    DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    download_dir = tempfile.mkdtemp(dir=DOWNLOAD_DIR)
+
     # If the provided URL is a direct GitHub link, skip article download
-    gh_match = re.match(r"^https?://(?:www\.)?github\.com/[^ \n]+", url, re.IGNORECASE)
-    if gh_match:
+    if _GH_HOST_RE.match(url):
         logger.info("Detected direct GitHub URL: %s", url)
-        return {"github_links": [url], "file_paths": []}
+        return {"github_links": [url], "file_paths": [], "download_dir": download_dir}
 
     logger.info("Downloading article: %s", url)
     try:
-        analyser = ArticleAnalyser(url=url)
+        analyser = ArticleAnalyser(url=url, save_path=Path(download_dir))
         analyser.download()
     except Exception as e:
         logger.exception("Failed to download article %s: %s", url, e)
-        return {"github_links": [], "file_paths": []}
+        return {"github_links": [], "file_paths": [], "download_dir": download_dir}
 
     try:
         links = analyser.analyze_github_links() or []
@@ -77,13 +121,40 @@ def download_and_analyze_article(state: AgentState) -> Dict[str, Any]:
     if not links:
         logger.warning("No GitHub links found in article %s", url)
 
-    return {"github_links": list(links), "file_paths": file_paths}
+    return {"github_links": list(links), "file_paths": file_paths, "download_dir": download_dir}
+
+
+def _download_repo_files(link: str, save_path: Path) -> List[Path]:
+    """
+    Download the key files of a single GitHub repo.
+
+    Errors are logged and result in an empty list so one bad repo does not fail the others.
+    """
+    logger.info("Processing GitHub repo: %s", link)
+    try:
+        gh_analyser = GithubAnalyser(repo_url=link, save_path=save_path)
+        gh_analyser.start()
+        files_map = gh_analyser.identify_and_download_key_files() or {}
+    except Exception as e:
+        logger.exception("Error processing repo %s: %s", link, e)
+        return []
+
+    files: List[Path] = []
+    for category, paths in files_map.items():
+        for p in paths:
+            try:
+                files.append(Path(p))
+            except Exception:
+                logger.warning("Skipping invalid path from repo %s: %s", link, p)
+
+    return files
 
 
 def process_github_repos(state: AgentState) -> Dict[str, List[Path]]:
     """
     Inspect found GitHub links and download key files.
 
+    Repos are fetched concurrently since each one is bound by GitHub API round trips.
     Returns dict with key 'file_paths' (list of Path).
     """
     links = state.get("github_links") or []
@@ -93,22 +164,11 @@ def process_github_repos(state: AgentState) -> Dict[str, List[Path]]:
         logger.info("No GitHub links to process.")
         return {"file_paths": new_files}
 
-    for link in links:
-        logger.info("Processing GitHub repo: %s", link)
-        try:
-            gh_analyser = GithubAnalyser(repo_url=link)
-            gh_analyser.start()
-            files_map = gh_analyser.identify_and_download_key_files() or {}
-        except Exception as e:
-            logger.exception("Error processing repo %s: %s", link, e)
-            continue
-
-        for category, paths in files_map.items():
-            for p in paths:
-                try:
-                    new_files.append(Path(p))
-                except Exception:
-                    logger.warning("Skipping invalid path from repo %s: %s", link, p)
+    save_path = Path(state.get("download_dir") or DOWNLOAD_DIR)
+    with ThreadPoolExecutor(max_workers=min(len(links), MAX_REPO_WORKERS)) as executor:
+        # map keeps the results in link order
+        for files in executor.map(lambda link: _download_repo_files(link, save_path), links):
+            new_files.extend(files)
 
     return {"file_paths": new_files}
 
@@ -167,14 +227,18 @@ def generate_solution(state: AgentState) -> Dict[str, str]:
     **User Input / Data:**
     """
 
-    model = ChatModel(system_prompt=system_prompt)
-
-    all_files = state.get("file_paths") or []
-    for file_path in all_files:
-        try:
-            model.add_document(file_path)
-        except Exception as e:
-            logger.exception("Failed to add document %s to model: %s", file_path, e)
+    try:
+        model = ChatModel(system_prompt=system_prompt)
+
+        all_files = state.get("file_paths") or []
+        for file_path in all_files:
+            try:
+                model.add_document(file_path)
+            except Exception as e:
+                logger.exception("Failed to add document %s to model: %s", file_path, e)
+    finally:
+        # Document contents are loaded into the model by now, so the downloads can go
+        _remove_download_dir(state.get("download_dir"))
 
     prompt = (
         "Analyze the provided file context and data structure. Based on this, generate the full Python "
@@ -191,16 +255,6 @@ def generate_solution(state: AgentState) -> Dict[str, str]:
     if not response:
         raise ValueError("Response from ChatModel is empty.")
 
-    downloaded_files = Path("tmp/")
-    if downloaded_files.exists():
-        try:
-            if downloaded_files.is_dir():
-                shutil.rmtree(downloaded_files)
-            else:
-                downloaded_files.unlink()
-        except Exception as e:
-            logger.warning("Failed to remove tmp path %s: %s", downloaded_files, e)
-
     # Ensure response is a string
     return {"ai_response": str(response)}
 
@@ -210,28 +264,13 @@ def clean_ai_response(state: AgentState) -> Dict[str, str]:
     Clean unwanted markdown fences and validate that the response is JSON-like.
     """
     raw = state.get("ai_response", "")
-    content = raw.strip()
 
-    # Remove common code fences
-    if content.startswith("```"):
-        # remove leading fence and optional language spec
-        first_newline = content.find("\n")
-        if first_newline != -1:
-            content = content[first_newline + 1 :]
-        else:
-            content = content[3:]
+    # Strip a leading fence (with optional language spec) and a trailing fence in one pass.
+    # Malformed JSON is passed through untouched so validation fails explicitly downstream.
+    return {"clean_response": _FENCE_RE.sub("", raw).strip()}
 
-    if content.endswith("```"):
-        content = content[:-3]
 
-    content = content.strip()
-
-    # If the model returned a pretty JSON with single quotes, try to normalize to valid JSON
-    # but do not attempt destructive fixes; prefer to pass through and let validation fail explicitly.
-    return {"clean_response": content}
-
-
-def create_files_from_response(state: AgentState) -> Dict[str, str]:
+def create_files_from_response(state: AgentState) -> Dict[str, Dict[str, str]]:
     """
     Parse the cleaned AI response (expected JSON) and create files on disk.
 
@@ -241,23 +280,13 @@ def create_files_from_response(state: AgentState) -> Dict[str, str]:
     if not content:
         raise ValueError("No cleaned AI response available to create files.")
 
-    # Try to ensure it's valid JSON first for clearer errors
+    # Parse and validate in a single pass with Pydantic's native JSON parser
     try:
-        parsed = json.loads(content)
-    except json.JSONDecodeError as e:
-        logger.exception("AI response is not valid JSON: %s", e)
-        # Try Pydantic validation which will give clearer messages if it's a valid JSON string representation
-        try:
-            result = ResultModel.model_validate_json(content)
-        except ValidationError as e2:
-            logger.error("Validation error for AI response: %s", e2)
-            raise ValueError("AI response is not in the expected ResultModel format.") from e2
-    else:
-        try:
-            result = ResultModel.model_validate(parsed)
-        except ValidationError as e:
-            logger.error("AI response structure invalid: %s", e)
-            raise ValueError("AI response is not in the expected ResultModel format.") from e
+        result = ResultModel.model_validate_json(content)
+    except ValidationError as e:
+        logger.error("AI response is not in the expected ResultModel format: %s", e)
+        logger.debug("Received AI response: %.2000s", content)
+        raise ValueError("AI response is not in the expected ResultModel format.") from e
 
     files_created: Dict[str, str] = {}
     base_dir = Path("results") / result.project_name
@@ -266,25 +295,17 @@ def create_files_from_response(state: AgentState) -> Dict[str, str]:
     for filename, fileinfo in result.files.items():
         safe_name = _sanitize_filename(filename)
         file_path = (base_dir / safe_name).resolve()
-        content_text = ""
-        if isinstance(fileinfo, dict):
-            content_text = fileinfo.get("content", "")
-        elif isinstance(fileinfo, str):
-            content_text = fileinfo
-        else:
-            logger.warning("Unexpected fileinfo type for %s: %s", filename, type(fileinfo))
-            content_text = str(fileinfo)
+        content_text = fileinfo.get("content", "")
 
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with file_path.open("w", encoding="utf-8") as f:
-                f.write(content_text)
+            # _sanitize_filename strips directories, so every file lands directly in base_dir
+            file_path.write_bytes(content_text.encode("utf-8"))
             files_created[filename] = str(file_path)
             logger.info("Created file %s", file_path)
         except Exception as e:
             logger.exception("Failed to write file %s: %s", file_path, e)
 
-    return {"create_files": json.dumps(files_created)}
+    return {"create_files": files_created}
 
 
 # 3. BUild the graph (Workflow)
@@ -1,6 +1,7 @@
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 
@@ -13,6 +14,54 @@ from agent import (
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Aynı anda çalıştırılacak en fazla proje sayısı
+MAX_WORKERS = 8
+
+
+def _run_one(row: pd.Series) -> dict:
+    """
+    Tek bir proje için agent'ı çalıştırır ve sonuç satırını döndürür.
+    """
+    project_title = row.get("Title", "Unknown Project")
+    github_url: str = str(row.get("Github URL"))
+
+    logger.info(f"Testing: {project_title} ({github_url})")
+
+    start_time = time.time()
+    status = "Failed"
+
+    try:
+        # AgentState'i hazırla
+        initial_state: AgentState = {
+            "article_url": github_url,  # CSV'deki github linkini kullanıyoruz
+            "github_links": [],
+            "file_paths": [],
+            "ai_response": "",
+        }
+
+        # Agent'ı çalıştır
+        output = app.invoke(initial_state)
+
+        # Başarılı olup olmadığını kontrol et (Dosya üretilmiş mi?)
+        if output.get("create_files"):
+            status = "Success"
+        else:
+            status = "No Files Created"
+
+    except Exception as e:
+        logger.error(f"Hata oluştu ({project_title}): {e}")
+        status = f"Error: {str(e)}"
+
+    duration = time.time() - start_time
+    logger.info(f"Result for {project_title}: {status}")
+
+    return {
+        "Project": project_title,
+        "URL": github_url,
+        "Status": status,
+        "Duration": f"{duration:.2f}s",
+    }
+
 
 def run_benchmark(csv_path="assets/projects.csv", sample_size=3):
     """
@@ -25,9 +74,10 @@ def run_benchmark(csv_path="assets/projects.csv", sample_size=3):
     logger.info(f"Benchmark başlatılıyor... {csv_path} okunuyor.")
 
     try:
-        df = pd.read_csv(csv_path)
+        # Sadece kullanılan sütunları oku (Title isteğe bağlı, eksikse hata vermez)
+        df = pd.read_csv(csv_path, usecols=lambda c: c in {"Title", "Github URL"})
         # Sadece Github URL'si olanları al
-        df = df[df["Github URL"].notna()]
+        df = df.dropna(subset=["Github URL"])
 
         # Rastgele örneklem al (Demo süresi kısıtlı olduğu için az sayıda seçiyoruz)
         sample = df.sample(n=min(sample_size, len(df)), random_state=42)
@@ -36,53 +86,14 @@ def run_benchmark(csv_path="assets/projects.csv", sample_size=3):
 
         logger.info(f"Toplam {len(sample)} proje üzerinde test yapılacak.")
 
-        for index, row in sample.iterrows():
-            project_title = row.get("Title", "Unknown Project")
-            github_url: str = str(row.get("Github URL"))
-
-            logger.info(f"Testing: {project_title} ({github_url})")
-
-            start_time = time.time()
-            status = "Failed"
-
-            try:
-                # AgentState'i hazırla
-                initial_state: AgentState = {
-                    "article_url": github_url,  # CSV'deki github linkini kullanıyoruz
-                    "github_links": [],
-                    "file_paths": [],
-                    "ai_response": "",
-                }
-
-                # Agent'ı çalıştır
-                output = app.invoke(initial_state)
-
-                # Başarılı olup olmadığını kontrol et (Dosya üretilmiş mi?)
-                if output.get("create_files"):
-                    status = "Success"
-                else:
-                    status = "No Files Created"
-
-            except Exception as e:
-                logger.error(f"Hata oluştu ({project_title}): {e}")
-                status = f"Error: {str(e)}"
-
-            duration = time.time() - start_time
-            results.append(
-                {
-                    "Project": project_title,
-                    "URL": github_url,
-                    "Status": status,
-                    "Duration": f"{duration:.2f}s",
-                }
-            )
-
-            logger.info(f"Result for {project_title}: {status}")
-            logger.info("-" * 30)
+        # Projeler ağ G/Ç ağırlıklı olduğu için her biri ayrı bir thread'de çalışır
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(sample)))) as executor:
+            # map sonuçları örneklem sırasıyla döndürür, böylece rapor her çalıştırmada aynı sırada olur
+            results.extend(executor.map(_run_one, (row for _, row in sample.iterrows())))
 
         # Sonuç raporu
         logger.info("\n=== BENCHMARK REPORT ===")
-        results_df = pd.DataFrame(results)
+        results_df = pd.DataFrame.from_records(results)
         print(results_df)
 
         # Sonuçları kaydet
@@ -1,20 +1,103 @@
+import hashlib
 import logging
 import os
 import re
 import stat
 import time
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
 import fitz  # PyMuPDF
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Shared across analysers so repeated downloads from the same host reuse keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# Matched from the start of link URIs (complete URLs) and searched for anywhere in page text
+_GITHUB_RE = re.compile(r"https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+")
+
+# A line break right after a URL continuation character and directly followed by URL characters,
+# i.e. a URL wrapped onto the next line
+_WRAP_RE = re.compile(r"(?<=[-_/])\n(?=[A-Za-z0-9_.-])")
+
+
+def _iter_link_uris(page: fitz.Page) -> Iterator[str]:
+    """
+    Yields the URI of every link on a page by walking the native link chain.
+    Cheaper than page.get_links(), which builds a dict for every link.
+    """
+    link = page.first_link
+    while link:
+        yield link.uri or ""
+        link = link.next
+
+
+def _page_text(page: fitz.Page) -> str:
+    """
+    Returns the text of a page line by line, without superscript spans.
+    Footnote markers are superscripts, so leaving them out keeps them from running into a URL.
+    """
+    lines = []
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", ()):
+            lines.append(
+                "".join(span["text"] for span in line["spans"] if not span["flags"] & fitz.TEXT_FONT_SUPERSCRIPT)
+            )
+    return "\n".join(lines)
+
+
+def _links_in_document(doc: fitz.Document) -> frozenset[str]:
+    """Returns the GitHub repo links an open PDF contains, both as link annotations and as plain text."""
+    github_links: set[str] = set()
+    for page in doc:
+        github_links |= {m.group(0) for uri in _iter_link_uris(page) if (m := _GITHUB_RE.match(uri))}
+
+        # Rejoin wrapped URLs so their first line is not mistaken for a complete one
+        text = _WRAP_RE.sub("", _page_text(page))
+        # Plain-text URLs are often followed by sentence punctuation, which the pattern accepts
+        github_links |= {m.group(0).rstrip(".") for m in _GITHUB_RE.finditer(text)}
+    return frozenset(github_links)
+
+
+@lru_cache(maxsize=32)
+def _extract_github_links(file_path: Path, size: int, mtime_ns: int) -> frozenset[str]:
+    """
+    Parses the PDF file and returns the GitHub repo links it contains.
+    Size and modification time are part of the cache key, so a re-analysed file is only parsed
+    again if it was rewritten (every download replaces the file).
+    """
+    with fitz.open(file_path) as doc:
+        return _links_in_document(doc)
+
 
 class ArticleAnalyser:
-    def __init__(self, url: str, filename: str = "article.pdf", save_path: Path = Path("tmp")):
+    def __init__(
+        self,
+        url: str,
+        filename: str | None = None,
+        save_path: Path = Path("tmp"),
+    ):
+        """
+        Args:
+            url: URL of the article PDF.
+            filename: Name of the downloaded file. Defaults to a hash of the URL, so different
+                articles saved to the same directory never overwrite each other.
+            save_path: Directory the article is downloaded into.
+        """
         self.url = url
-        self.filename = filename
+        self.filename = filename or f"{hashlib.blake2b(url.encode(), digest_size=8).hexdigest()}.pdf"
         self.save_path = save_path
         self.file_path = self.save_path / self.filename
 
@@ -34,18 +117,26 @@ class ArticleAnalyser:
             return
 
         logger.debug(f"Downloading article from {self.url}")
+        # Stream into a partial file so an interrupted download is never mistaken for a cached one
+        part_path = self.file_path.with_name(self.file_path.name + ".part")
         try:
-            response = requests.get(self.url, timeout=10)
-            response.raise_for_status()
+            with _SESSION.get(self.url, timeout=10, stream=True) as response:
+                response.raise_for_status()
 
-            self.save_path.mkdir(parents=True, exist_ok=True)
+                self.save_path.mkdir(parents=True, exist_ok=True)
 
-            with open(self.file_path, "wb") as f:
-                f.write(response.content)
+                # iter_content wraps mid-stream urllib3 errors in requests exceptions
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+            os.replace(part_path, self.file_path)
             logger.debug(f"Article downloaded and saved to {self.file_path}")
         except requests.RequestException as e:
             logger.error(f"Failed to download article from {self.url}: {e}")
             raise RuntimeError(f"Failed to download article: {e}") from e
+        finally:
+            # No-op after a successful os.replace
+            part_path.unlink(missing_ok=True)
 
     def cleanup(self):
         """Deletes the downloaded file. (Public method)"""
@@ -82,26 +173,33 @@ class ArticleAnalyser:
 
     def analyze_github_links(self) -> set[str] | None:
         """Finds GitHub links inside the PDF."""
-        github_links = set()
-        regex_pattern = r"https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+"
-
-        if not self.file_path.exists():
-            logger.info("File not found via manual check, downloading now...")
-            self.download()
+        # download() returns early when the file is already present
+        self.download()
 
         try:
-            with fitz.open(self.file_path) as doc:
-                for page in doc:
-                    links = page.get_links()
-                    if links:
-                        for link in links:
-                            uri = link.get("uri", "")
-                            match = re.search(regex_pattern, uri)
-                            if match:
-                                github_links.add(match.group(0))
+            st = self.file_path.stat()
+            github_links = set(_extract_github_links(self.file_path, st.st_size, st.st_mtime_ns))
             logger.debug(f"Extracted GitHub links: {github_links}")
         except Exception as e:
             logger.error(f"Error analyzing article at {self.file_path}: {e}")
             return None  # You can return None or an empty set in case of error
 
         return github_links
+
+    def analyze_in_memory(self) -> set[str] | None:
+        """
+        Finds GitHub links inside the PDF without writing it to disk.
+        For one-shot analysis where the file is not needed afterwards; use download() and
+        analyze_github_links() when the PDF should be kept.
+        """
+        try:
+            response = _SESSION.get(self.url, timeout=10)
+            response.raise_for_status()
+            with fitz.open(stream=response.content, filetype="pdf") as doc:
+                github_links = set(_links_in_document(doc))
+            logger.debug(f"Extracted GitHub links: {github_links}")
+        except Exception as e:
+            logger.error(f"Error analyzing article from {self.url}: {e}")
+            return None
+
+        return github_links
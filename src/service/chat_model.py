@@ -1,5 +1,7 @@
 import logging
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -7,17 +9,30 @@ import fitz
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Uploaded files with these suffixes are read as UTF-8 text; other non-PDF files get no content
+TEXT_SUFFIXES = frozenset({".txt", ".md", ".py", ".csv"})
 
-class UploadedFile(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class UploadedFile:
     filename: str
     path: Path
     content: str | bytes
 
 
+@lru_cache(maxsize=8)
+def _get_llm(api_key: str, model: str, temperature: float) -> ChatGoogleGenerativeAI:
+    """Builds the Gemini client once per configuration and shares it across ChatModel instances."""
+    return ChatGoogleGenerativeAI(
+        google_api_key=api_key,
+        model=model,
+        temperature=temperature,
+    )
+
+
 class ChatModel:
     def __init__(
         self,
@@ -30,31 +45,28 @@ class ChatModel:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables.")
 
-        self._llm = ChatGoogleGenerativeAI(
-            google_api_key=api_key,
-            model=model,
-            temperature=temperature,
-        )
+        self._llm = _get_llm(api_key, model, temperature)
         self._system_prompt = system_prompt
         self._uploaded_files: list[UploadedFile] = []
+        # File context for the system prompt; built on the next send() after documents change
+        self._file_context: str | None = None
 
     def add_document(self, file: Path) -> None:
         """Dosyayı yükler ve içeriğini okur."""
         if not file.exists():
             raise FileNotFoundError(f"Dosya bulunamadı: {file}")
 
-        with file.open("rb") as f:
-            content = f.read()
-
+        suffix = file.suffix.lower()
         extracted_text = ""
-        if file.suffix.lower() == ".pdf":
-            extracted_text = self._parse_pdf(content)
-        elif file.suffix.lower() in [".txt", ".md", ".py", ".csv"]:
-            extracted_text = content.decode("utf-8", errors="ignore")
+        if suffix == ".pdf":
+            extracted_text = self._parse_pdf(file.read_bytes())
+        elif suffix in TEXT_SUFFIXES:
+            extracted_text = file.read_text(encoding="utf-8", errors="ignore")
 
         uploaded_file = UploadedFile(filename=file.name, path=file, content=extracted_text)
         self._uploaded_files.append(uploaded_file)
-        logger.debug(f"Uploaded file: {uploaded_file}")
+        self._file_context = None
+        logger.debug("Uploaded file: %s (%d chars)", uploaded_file.filename, len(extracted_text))
 
     def add_documents(self, files: list[Path]) -> None:
         for file in files:
@@ -63,21 +75,21 @@ class ChatModel:
     def _parse_pdf(self, file_bytes: bytes) -> str:
         try:
             with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-                text = ""
-                for page in doc:
-                    text += str(page.get_text()) + "\n"
+                # One join instead of re-copying the accumulated text for every page
+                text = "".join(page.get_text() + "\n" for page in doc)
             return text
         except Exception as e:
             raise ValueError(f"Failed to parse PDF file: {e}")
 
     def send(self, user_message: str) -> str | list[str | dict[Any, Any]] | None:
-        file_context = ""
-        if self._uploaded_files:
-            for file in self._uploaded_files:
-                file_context += f"\nFilename: {file.filename}\nFilepath: {file.path.as_posix()}\nContent:\n{file.content}\n"
+        if self._file_context is None:
+            self._file_context = "".join(
+                f"\nFilename: {file.filename}\nFilepath: {file.path.as_posix()}\nContent:\n{file.content}\n"
+                for file in self._uploaded_files
+            )
 
         messages = [
-            SystemMessage(content=self._system_prompt + "\n\n" + file_context),
+            SystemMessage(content=self._system_prompt + "\n\n" + self._file_context),
             HumanMessage(content=user_message),
         ]
 
@@ -35,33 +35,48 @@ class CSVAnalyser:
     def __init__(self, file_path: Path | None = None) -> None:
         load_dotenv()
         self.df = pd.read_csv(file_path or os.getenv("CSV_FILE_PATH", "assets/projects.csv"))
+        # All searchable URLs of a row lowercased into one string, so a search is a single pass.
+        # The NUL separator keeps a query from matching across two columns.
+        self._haystack = (
+            self.df["Paper URL"].fillna("")
+            + "\0"
+            + self.df["Specific URL"].fillna("")
+            + "\0"
+            + self.df["Github URL"].fillna("")
+        ).str.lower()
+        # Exact URL -> first row position, so full-URL queries skip the scan entirely
+        self._url_index: dict[str, int] = {}
+        for i, urls in enumerate(self._haystack):
+            for url in urls.split("\0"):
+                if url:
+                    self._url_index.setdefault(url.strip(), i)
 
     def search_project(self, query: str) -> ProjectInfo | None:
-        query = query.strip()
+        query = query.strip().lower()
 
-        mask = (
-            self.df["Paper URL"].str.contains(query, case=False, na=False)
-            | self.df["Specific URL"].str.contains(query, case=False, na=False)
-            | self.df["Github URL"].str.contains(query, case=False, na=False)
-        )
-
-        results = self.df[mask]
+        index = self._url_index.get(query)
+        if index is not None:
+            results = self.df.iloc[index : index + 1]
+        else:
+            mask = self._haystack.str.contains(query, regex=False, na=False)
+            results = self.df[mask]
 
         if not results.empty:
+            row = results.iloc[0]
             return ProjectInfo(
-                title=results.iloc[0]["Title"],
-                github_url=results.iloc[0]["Github URL"],
-                main_categort=results.iloc[0]["Main Category"],
-                secondary_category=results.iloc[0]["Secondary Category"],
-                tags=results.iloc[0]["Tags"],
-                paper_url=results.iloc[0]["Paper URL"],
-                specific_url=results.iloc[0]["Specific URL"],
-                documentation_url=results.iloc[0]["Documentation"],
-                dependencies_count=results.iloc[0]["Dependencies"],
-                special_features=results.iloc[0]["Special features"],
-                entry_points=results.iloc[0]["Entry Points (Scripts)"],
-                execution_command=results.iloc[0]["Execution Command"],
-                extrenal_credentials=results.iloc[0].get("External Credentials"),
-                dataset_dependencies=results.iloc[0].get("Dataset Dependencies"),
+                title=row["Title"],
+                github_url=row["Github URL"],
+                main_categort=row["Main Category"],
+                secondary_category=row["Secondary Category"],
+                tags=row["Tags"],
+                paper_url=row["Paper URL"],
+                specific_url=row["Specific URL"],
+                documentation_url=row["Documentation"],
+                dependencies_count=row["Dependencies"],
+                special_features=row["Special features"],
+                entry_points=row["Entry Points (Scripts)"],
+                execution_command=row["Execution Command"],
+                extrenal_credentials=row.get("External Credentials"),
+                dataset_dependencies=row.get("Dataset Dependencies"),
             )
         return None
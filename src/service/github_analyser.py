@@ -1,15 +1,54 @@
-import base64
 import logging
 import os
 import re
 import shutil
 import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Number of key files downloaded concurrently; the session's connection pool is sized to match
+DOWNLOAD_WORKERS = 8
+
+# Key files larger than this are skipped so the prompt built from them stays bounded.
+# Matches the 1 MB limit of the /contents/ endpoint, which returned no content for bigger blobs.
+MAX_FILE_SIZE = 1024 * 1024
+
+# Captures the owner and repository name from a GitHub URL
+_REPO_RE = re.compile(r"github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)")
+
+# Dependency definition files, matched against the lowercased file name
+_DEP_FILES = frozenset({"requirements.txt", "setup.py", "pipfile", "pyproject.toml"})
+
+# Path fragments that mark example or demo scripts, matched against the lowercased path
+_EXAMPLE_RE = re.compile(r"example|demo|sample")
+
+
+def _categorize(path_str: str) -> str | None:
+    """Returns the key-file category of a repository path, or None if it is not a key file."""
+    path_lower = path_str.lower()
+    filename = path_lower.rpartition("/")[2]
+
+    # 1. Dependency definitions
+    if filename in _DEP_FILES:
+        return "requirements"
+
+    # 2. Examples or Demos (must be python files)
+    if path_str.endswith(".py") and _EXAMPLE_RE.search(path_lower):
+        return "examples"
+
+    # 3. Documentation
+    if "readme" in filename:
+        return "docs"
+
+    return None
+
 
 class GithubAnalyser:
     def __init__(self, repo_url: str, token: str | None = None, save_path: Path = Path("tmp")):
@@ -31,6 +70,10 @@ class GithubAnalyser:
         # Session will be initialized in start() or __enter__
         self.session: requests.Session | None = None
         self.api_base = f"https://api.github.com/repos/{self.owner}/{self.repo_name}"
+        # Filled by get_default_branch() on the first successful lookup
+        self._default_branch: str | None = None
+        # Local directories already created by download_file, so shared parents are made only once
+        self._mkdir_cache: set[Path] = set()
 
     def __enter__(self):
         """Context Manager Entry: Initializes the session and directory."""
@@ -54,6 +97,13 @@ class GithubAnalyser:
 
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
+        # One pooled keep-alive connection per download worker, per host (api. and raw.)
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=DOWNLOAD_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount("https://", adapter)
 
         if self.token:
             self.session.headers.update({"Authorization": f"token {self.token}"})
@@ -70,6 +120,7 @@ class GithubAnalyser:
         if self.session:
             self.session.close()
             self.session = None
+        self._mkdir_cache.clear()
 
         # Cleanup: Remove the entire directory tree
         def _on_rm_error(func, path, exc_info):
@@ -89,8 +140,7 @@ class GithubAnalyser:
 
     def _parse_repo_url(self) -> tuple[str, str]:
         """Parses the owner and repository name from the URL."""
-        pattern = r"github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)"
-        match = re.search(pattern, self.repo_url)
+        match = _REPO_RE.search(self.repo_url)
         if not match:
             raise ValueError(f"Invalid GitHub URL: {self.repo_url}")
         return match.group(1), match.group(2)
@@ -114,7 +164,11 @@ class GithubAnalyser:
         """
         Determines the default branch (main, master, etc.) via API.
         If API fails, it attempts to guess common names.
+        The detected branch is cached, so later calls make no request.
         """
+        if self._default_branch is not None:
+            return self._default_branch
+
         session = self._ensure_session()
 
         try:
@@ -123,17 +177,19 @@ class GithubAnalyser:
             response.raise_for_status()
             branch = response.json().get("default_branch", "main")
             logger.debug(f"Detected default branch: {branch}")
+            self._default_branch = branch
             return branch
         except Exception as e:
             logger.warning(f"Could not detect default branch via API: {e}. Trying fallbacks.")
             return "master"
 
-    def get_repo_structure(self) -> list[dict]:
+    def get_repo_structure(self, branch: str | None = None) -> list[dict]:
         """
         Fetches the entire file tree of the repository recursively.
+        Uses the default branch unless a branch is given.
         """
         session = self._ensure_session()
-        default_branch = self.get_default_branch()
+        default_branch = branch or self.get_default_branch()
 
         try:
             # GitHub Git Database API: Get Tree recursively
@@ -152,77 +208,61 @@ class GithubAnalyser:
         Returns a dictionary mapping categories to local file paths.
         """
         # get_repo_structure calls _ensure_session internally, so we are safe here.
-        structure = self.get_repo_structure()
+        # The branch is resolved once and shared by the tree fetch and every download.
+        branch = self.get_default_branch()
+        structure = self.get_repo_structure(branch)
         downloaded_files: dict[str, list[Path]] = {"requirements": [], "examples": [], "docs": []}
 
-        to_download = []
-
-        for item in structure:
-            if item["type"] != "blob":
-                continue  # Skip directories/submodules
-
-            path_str = item["path"]
-            filename = Path(path_str).name.lower()
-            path_lower = path_str.lower()
-
-            # Logic to categorize files
-            category = None
-
-            # 1. Dependency definitions
-            if filename in ["requirements.txt", "setup.py", "pipfile", "pyproject.toml"]:
-                category = "requirements"
-
-            # 2. Examples or Demos (must be python files)
-            elif (
-                "example" in path_lower
-                or "demo" in path_lower
-                or "sample" in path_lower
-                or "sample_script" in path_lower
-            ) and path_str.endswith(".py"):
-                category = "examples"
-
-            # 3. Documentation
-            elif "readme" in filename:
-                category = "docs"
-
-            if category:
-                to_download.append((path_str, category))
+        # Directories and submodules are skipped; only file blobs are categorized
+        to_download = [
+            (item["path"], category)
+            for item in structure
+            if item["type"] == "blob"
+            and item.get("size", 0) <= MAX_FILE_SIZE
+            and (category := _categorize(item["path"]))
+        ]
 
         # Download the identified files
+        # Each download is an independent API round trip, so they run concurrently.
+        # map keeps results in tree order, which keeps the generated prompt stable.
         logger.info(f"Found {len(to_download)} relevant files. Starting download...")
-        for remote_path, category in to_download:
-            local_path = self.download_file(remote_path)
-            if local_path:
-                downloaded_files[category].append(local_path)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            local_paths = executor.map(
+                lambda remote_path: self.download_file(remote_path, branch),
+                (remote_path for remote_path, _ in to_download),
+            )
+            for (_, category), local_path in zip(to_download, local_paths):
+                if local_path:
+                    downloaded_files[category].append(local_path)
 
         return downloaded_files
 
-    def download_file(self, remote_path: str) -> Path | None:
+    def download_file(self, remote_path: str, branch: str | None = None) -> Path | None:
         """
-        Downloads a specific file's content from the GitHub API.
+        Downloads a specific file's raw content from GitHub.
         Public method, can be used to download specific files manually.
+        Uses the default branch unless a branch is given.
         """
         session = self._ensure_session()
+        branch = branch or self.get_default_branch()
 
-        url = f"{self.api_base}/contents/{remote_path}"
+        # raw.githubusercontent.com serves the bytes directly, no JSON/base64 wrapping
+        url = f"https://raw.githubusercontent.com/{self.owner}/{self.repo_name}/{branch}/{quote(remote_path)}"
         try:
-            resp = session.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-
-            # GitHub API returns content in Base64
-            if "content" not in data:
-                return None
-
-            content = base64.b64decode(data["content"]).decode("utf-8", errors="ignore")
-
-            # Construct local path
-            local_file_path = self.save_dir / remote_path
-            # Ensure subdirectories exist locally (e.g., examples/advanced/test.py)
-            local_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(local_file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            with session.get(url, stream=True) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+
+                # Construct local path
+                local_file_path = self.save_dir / remote_path
+                # Ensure subdirectories exist locally (e.g., examples/advanced/test.py)
+                parent = local_file_path.parent
+                if parent not in self._mkdir_cache:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    self._mkdir_cache.add(parent)
+
+                with open(local_file_path, "wb") as f:
+                    shutil.copyfileobj(resp.raw, f, length=64 * 1024)
 
             return local_file_path
 